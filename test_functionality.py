@@ -67,6 +67,70 @@ def test_xsd_validation():
     print(f"  Message: {message}\n")
     assert is_valid, "XML should be valid against XSD"
 
+def test_xsd_validation_repeated():
+    """Test repeated validation against the same (cached) schema."""
+    print("Testing repeated XSD validation...")
+    invalid_xml = xml_content.replace("<year>2003</year>", "<year>unknown</year>")
+    
+    is_valid, message = XMLUtilities.validate_with_xsd(invalid_xml, xsd_content)
+    print(f"  Invalid document: {is_valid}, {message}")
+    assert not is_valid, "XML with non-integer year should be invalid"
+    assert "year" in message, "Error message should mention the year element"
+    
+    # Errors from the previous run must not leak into the next validation
+    is_valid, message = XMLUtilities.validate_with_xsd(xml_content, xsd_content)
+    print(f"  Valid document: {is_valid}, {message}\n")
+    assert is_valid, "XML should be valid against XSD"
+
+def test_xsd_validation_streaming():
+    """Test streaming XSD validation of a file object."""
+    import io
+    print("Testing streaming XSD validation...")
+    is_valid, message = XMLUtilities.validate_file_with_xsd(
+        io.BytesIO(xml_content.encode('utf-8')), xsd_content)
+    print(f"  Valid: {is_valid}, {message}")
+    assert is_valid, "XML should be valid against XSD"
+    
+    invalid_xml = xml_content.replace("<year>2003</year>", "<year>unknown</year>")
+    is_valid, message = XMLUtilities.validate_file_with_xsd(
+        io.BytesIO(invalid_xml.encode('utf-8')), xsd_content)
+    print(f"  Invalid document: {is_valid}, {message}\n")
+    assert not is_valid, "XML with non-integer year should be invalid"
+    assert "'unknown'" in message, "Error message should name the invalid value"
+    
+    # Errors of the previous document must not be reported for the next one
+    is_valid, message = XMLUtilities.validate_file_with_xsd(
+        io.BytesIO(b"<bookstore><book>"), xsd_content)
+    print(f"  Malformed document: {is_valid}, {message}\n")
+    assert not is_valid, "Malformed XML should be invalid"
+    assert "'unknown'" not in message, "Stale errors should not be reported"
+    assert message.startswith("Line 1: "), "Syntax errors should report their line"
+    assert "b'" not in message and 'b"' not in message, "Message should not be a bytes repr"
+
+def test_xsd_validation_many():
+    """Test validating several documents against one schema."""
+    print("Testing batch XSD validation...")
+    invalid_xml = xml_content.replace("<year>2003</year>", "<year>unknown</year>")
+    results = XMLUtilities.validate_many_with_xsd(
+        [xml_content, invalid_xml, "<bookstore>", xml_content], xsd_content)
+    print(f"  Results: {[is_valid for is_valid, _ in results]}\n")
+    assert [is_valid for is_valid, _ in results] == [True, False, False, True], \
+        "Results should be returned in input order"
+    assert "year" in results[1][1], "Error message should mention the year element"
+
+def test_dtd_validation():
+    """Test DTD validation."""
+    print("Testing DTD validation...")
+    dtd_content = """<!ELEMENT root (child+)>
+<!ELEMENT child (#PCDATA)>"""
+    is_valid, message = XMLUtilities.validate_with_dtd("<root><child>text</child></root>", dtd_content)
+    print(f"  Valid: {is_valid}, {message}")
+    assert is_valid, "XML should be valid against DTD"
+    
+    is_valid, message = XMLUtilities.validate_with_dtd("<root><other/></root>", dtd_content)
+    print(f"  Invalid document: {is_valid}, {message}\n")
+    assert not is_valid, "XML with undeclared element should be invalid"
+
 def test_xpath_query():
     """Test XPath query."""
     print("Testing XPath queries...")
@@ -164,6 +228,58 @@ def test_xml_formatting():
     print(f"  Original: {unformatted}")
     print(f"  Formatted:\n{formatted}\n")
     assert "<child>" in formatted, "Formatted XML should contain child element"
+    assert "\n  <child>text</child>\n" in formatted, "Child element should be indented"
+    assert "\n\n" not in formatted, "Formatted XML should not contain blank lines"
+
+def test_xml_formatting_declared_encoding():
+    """Test formatting text that declares a non-UTF-8 encoding."""
+    print("Testing XML formatting with an encoding declaration...")
+    latin1_xml = '<?xml version="1.0" encoding="ISO-8859-1"?><a>é</a>'
+    formatted = XMLUtilities.format_xml(latin1_xml)
+    print(f"  Formatted:\n{formatted}\n")
+    assert "<a>é</a>" in formatted, "Non-ASCII text should not be re-decoded"
+    
+    formatted = XMLUtilities.format_xml(latin1_xml.encode('iso-8859-1'))
+    assert "<a>é</a>" in formatted, "Encoded input should use its declared encoding"
+
+def test_bytes_input():
+    """Test that XML content can be passed as bytes."""
+    print("Testing bytes input...")
+    xml_bytes = xml_content.encode('utf-8')
+    is_valid, message = XMLUtilities.validate_with_xsd(xml_bytes, xsd_content)
+    print(f"  Valid: {is_valid}, {message}")
+    assert is_valid, "XML bytes should be valid against XSD"
+    
+    results = XMLUtilities.xpath_query(xml_bytes, "//book/title/text()")
+    print(f"  Book titles: {results}")
+    assert results == XMLUtilities.xpath_query(xml_content, "//book/title/text()"), \
+        "Bytes and string input should give the same results"
+    
+    assert XMLUtilities.format_xml(xml_bytes) == XMLUtilities.format_xml(xml_content), \
+        "Bytes and string input should format the same"
+    
+    # Mutable buffers are parsed without being cached
+    buffer = bytearray(xml_bytes)
+    assert len(XMLUtilities.xpath_query(buffer, "//book")) == 2, "Should find 2 books"
+    buffer[buffer.index(b'<book category="cooking">'):buffer.rindex(b'</book>') + 7] = b''
+    assert len(XMLUtilities.xpath_query(memoryview(buffer), "//book")) == 1, \
+        "Changes to a buffer should be seen by the next query"
+    print()
+
+def test_parse_xml_private_tree():
+    """Test that trees returned by parse_xml are not shared with the parse cache."""
+    print("Testing parse_xml returns a private tree...")
+    assert len(XMLUtilities.xpath_query(xml_content, "//book")) == 2, "Should find 2 books"
+    
+    tree = XMLUtilities.parse_xml(xml_content)
+    assert tree is not XMLUtilities.parse_xml(xml_content), "Each call should parse a new tree"
+    tree.remove(tree[0])
+    
+    assert len(XMLUtilities.xpath_query(xml_content, "//book")) == 2, \
+        "Modifying a returned tree should not affect later queries"
+    is_valid, message = XMLUtilities.validate_with_xsd(xml_content, xsd_content)
+    assert is_valid, f"Modifying a returned tree should not affect validation: {message}"
+    print()
 
 def test_xml_tree_structure():
     """Test XML tree structure."""
@@ -184,10 +300,17 @@ if __name__ == "__main__":
     try:
         test_xml_validation()
         test_xsd_validation()
+        test_xsd_validation_repeated()
+        test_xsd_validation_streaming()
+        test_xsd_validation_many()
+        test_dtd_validation()
         test_xpath_query()
         test_xpath_scalar_functions()
         test_xpath_query_with_context()
         test_xml_formatting()
+        test_xml_formatting_declared_encoding()
+        test_bytes_input()
+        test_parse_xml_private_tree()
         test_xml_tree_structure()
         
         print("=" * 60)
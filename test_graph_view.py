@@ -120,6 +120,76 @@ def test_namespace_handling():
         return False
 
 
+def test_key_with_invalid_field():
+    """Test that an invalid key field XPath only skips that field."""
+    from PyQt6.QtWidgets import QApplication
+    
+    # Create app if doesn't exist
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    
+    from xmleditor.xml_graph_view import XMLGraphScene
+    
+    xml_content = """<library>
+        <book><isbn>1</isbn></book>
+        <loan><ref>1</ref></loan>
+    </library>"""
+    schema_content = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+        <xs:element name="library">
+            <xs:key name="bookKey">
+                <xs:selector xpath="book"/>
+                <xs:field xpath="isbn"/>
+            </xs:key>
+            <xs:key name="brokenKey">
+                <xs:selector xpath="loan"/>
+                <xs:field xpath="ref[["/>
+            </xs:key>
+            <xs:keyref name="loanRef" refer="bookKey">
+                <xs:selector xpath="loan"/>
+                <xs:field xpath="ref"/>
+            </xs:keyref>
+        </xs:element>
+    </xs:schema>"""
+    
+    scene = XMLGraphScene()
+    scene.load_xml(xml_content, schema_content=schema_content)
+    nodes = {node.tag: node for node in scene.nodes}
+    
+    assert nodes["book"].is_key and nodes["isbn"].is_key, "Valid key should be marked"
+    assert nodes["loan"].is_key, "Key with an invalid field should still mark its elements"
+    assert nodes["ref"].is_keyref, "Keyref field should be marked"
+    assert len(scene.key_references) == 1, f"Expected 1 key reference, got {len(scene.key_references)}"
+    
+    print("  Invalid key fields are skipped individually")
+
+
+def test_scene_bounds_long_labels():
+    """Test that the scene bounds include labels wider than their node."""
+    from PyQt6.QtWidgets import QApplication
+    
+    # Create app if doesn't exist
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    
+    from xmleditor.xml_graph_view import XMLGraphScene
+    
+    long_tag = "a_very_long_root_element_name_that_overflows_its_node"
+    xml_content = f"<{long_tag}><child>some long text content</child></{long_tag}>"
+    
+    for layout in ("tree_vertical", "tree_horizontal", "radial", "compact"):
+        scene = XMLGraphScene()
+        scene.set_layout_algorithm(layout)
+        scene.load_xml(xml_content)
+        
+        bounds = scene._compute_scene_bounds()
+        assert bounds.contains(scene.itemsBoundingRect()), \
+            f"Scene bounds should contain all labels with the {layout} layout"
+    
+    print("  Scene bounds include long labels")
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("XML Editor - Graph View Tests")
@@ -139,6 +209,12 @@ if __name__ == "__main__":
         print("\nTesting namespace handling...")
         test_namespace_handling()
         
+        print("\nTesting key references...")
+        test_key_with_invalid_field()
+        
+        print("\nTesting scene bounds...")
+        test_scene_bounds_long_labels()
+        
         print()
         print("=" * 60)
         print("All graph view tests passed! ✓")
@@ -194,6 +194,59 @@ def test_repeating_elements():
         print(f"✗ Error: {e}")
         raise
 
+def test_optional_elements():
+    """Test that children missing from some instances are marked optional."""
+    print("\n\nTesting optional element detection...")
+    print("=" * 60)
+    
+    # 'discount' is absent from the first item, 'note' from the second
+    xml_with_optional = """<?xml version="1.0" encoding="UTF-8"?>
+<items>
+    <item><name>A</name><note>first</note></item>
+    <item><name>B</name><discount>5</discount></item>
+</items>"""
+    
+    try:
+        dtd = XMLUtilities.generate_dtd_schema(xml_with_optional)
+        print(dtd)
+        assert "<!ELEMENT item (name, note?, discount?)>" in dtd
+        print("✓ Optional elements detected in DTD with ? quantifier")
+        
+        xsd = XMLUtilities.generate_xsd_schema(xml_with_optional)
+        is_valid, message = XMLUtilities.validate_with_xsd(xml_with_optional, xsd)
+        assert is_valid, message
+        print("✓ Source document is valid against the generated XSD")
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        raise
+
+def test_comments_ignored():
+    """Test that comments and processing instructions are not treated as elements."""
+    print("\n\nTesting comment handling...")
+    print("=" * 60)
+    
+    xml_with_comments = """<?xml version="1.0" encoding="UTF-8"?>
+<root>
+    <!-- first item -->
+    <item>1</item>
+    <?render inline?>
+    <item>2</item>
+</root>"""
+    
+    try:
+        dtd = XMLUtilities.generate_dtd_schema(xml_with_comments)
+        print(dtd)
+        assert "<!ELEMENT root (item+)>" in dtd
+        print("✓ Comments and processing instructions skipped in DTD")
+        
+        xsd = XMLUtilities.generate_xsd_schema(xml_with_comments)
+        is_valid, message = XMLUtilities.validate_with_xsd(xml_with_comments, xsd)
+        assert is_valid, message
+        print("✓ Source document is valid against the generated XSD")
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        raise
+
 def test_data_type_inference():
     """Test that data types are inferred correctly."""
     print("\n\nTesting data type inference...")
@@ -225,6 +278,8 @@ if __name__ == "__main__":
         test_xsd_generation()
         test_dtd_generation()
         test_repeating_elements()
+        test_optional_elements()
+        test_comments_ignored()
         test_data_type_inference()
         
         print("\n" + "=" * 60)
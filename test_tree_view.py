@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script to verify XML tree view functionality.
+"""
+
+import sys
+import os
+
+# Ensure Qt uses offscreen platform for headless testing
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+_app = None
+
+XML_CONTENT = """<library>
+    <shelf name="fiction">
+        <book id="1">
+            <title>First</title>
+            <chapter><section>Deep</section></chapter>
+        </book>
+        <book id="2"><title>Second</title></book>
+    </shelf>
+</library>"""
+
+
+def _create_tree_view():
+    """Create a tree view (requires QApplication)."""
+    global _app
+    from PyQt6.QtWidgets import QApplication
+
+    # Create app if doesn't exist, and keep it alive for later tests
+    _app = QApplication.instance()
+    if _app is None:
+        _app = QApplication(sys.argv)
+
+    from xmleditor.xml_tree_view import XMLTreeView
+    return XMLTreeView()
+
+
+def _placeholder_only(item) -> bool:
+    """Check that an item only holds the placeholder child."""
+    return item.childCount() == 1 and item.child(0).text(0) == ""
+
+
+def test_lazy_population():
+    """Test that children are created when an item is first expanded."""
+    from xmleditor.xml_tree_view import CHILDREN_ROLE
+
+    tree_view = _create_tree_view()
+    tree_view.load_xml(XML_CONTENT)
+
+    # load_xml creates the levels shown by expandToDepth(1)
+    root = tree_view.topLevelItem(0)
+    shelf = root.child(0)
+    assert root.text(0) == "library" and root.isExpanded(), "Root should be expanded"
+    assert shelf.text(0) == "shelf" and shelf.isExpanded(), "Shelf should be expanded"
+    assert [shelf.child(i).text(0) for i in range(shelf.childCount())] == ["book", "book"], \
+        "Children of the expanded shelf should be created"
+
+    # Collapsed items only hold a placeholder
+    book = shelf.child(0)
+    assert not book.isExpanded(), "Book should be collapsed"
+    assert _placeholder_only(book), "Collapsed book should only hold the placeholder"
+
+    # Expanding creates the real children exactly once
+    book.setExpanded(True)
+    assert [book.child(i).text(0) for i in range(book.childCount())] == ["title", "chapter"], \
+        "Expanding should create the real children"
+    assert book.data(0, CHILDREN_ROLE) is None, "Pending children should be consumed"
+    book.setExpanded(False)
+    book.setExpanded(True)
+    assert book.childCount() == 2, "Expanding again should not add children"
+
+    chapter = book.child(1)
+    assert _placeholder_only(chapter), "Nested collapsed item should only hold the placeholder"
+
+    print("  Children are created on first expansion")
+
+
+def test_lazy_item_xpath():
+    """Test XPath and selection of lazily created items."""
+    tree_view = _create_tree_view()
+    tree_view.load_xml(XML_CONTENT)
+
+    selected = []
+    tree_view.nodeSelected.connect(selected.append)
+
+    shelf = tree_view.topLevelItem(0).child(0)
+    second_book = shelf.child(1)
+    second_book.setExpanded(True)
+    title = second_book.child(0)
+
+    tree_view.setCurrentItem(title)
+    assert tree_view.get_selected_xpath() == "/library/shelf/book[2]/title", \
+        f"Unexpected XPath: {tree_view.get_selected_xpath()}"
+    assert selected[-1] == "/library/shelf/book[2]/title", "Selection should emit the XPath"
+
+    first_book = shelf.child(0)
+    first_book.setExpanded(True)
+    chapter = first_book.child(1)
+    chapter.setExpanded(True)
+    section = chapter.child(0)
+    assert tree_view._get_xpath_for_item(section) == "/library/shelf/book[1]/chapter/section", \
+        f"Unexpected XPath: {tree_view._get_xpath_for_item(section)}"
+
+    print("  Lazily created items have correct XPaths")
+
+
+def test_tooltips_for_truncated_text():
+    """Test that only truncated values get a tooltip."""
+    long_text = "x" * 60
+    long_attr = "y" * 60
+    xml_content = f'<root><long a="{long_attr}">{long_text}</long><short a="b">text</short></root>'
+
+    tree_view = _create_tree_view()
+    tree_view.load_xml(xml_content)
+
+    root = tree_view.topLevelItem(0)
+    long_item, short_item = root.child(0), root.child(1)
+
+    assert long_item.text(1) == long_text[:50] + "...", "Long text should be truncated"
+    assert long_item.toolTip(1) == long_text, "Truncated text should have a tooltip"
+    assert long_item.toolTip(2) == f"a={long_attr}", "Truncated attributes should have a tooltip"
+
+    assert short_item.text(1) == "text", "Short text should not be truncated"
+    assert short_item.toolTip(1) == "", "Short text should not have a tooltip"
+    assert short_item.toolTip(2) == "", "Short attributes should not have a tooltip"
+
+    print("  Tooltips are set for truncated values only")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("XML Editor - Tree View Tests")
+    print("=" * 60)
+    print()
+
+    try:
+        print("Testing lazy population...")
+        test_lazy_population()
+
+        print("\nTesting XPath of lazily created items...")
+        test_lazy_item_xpath()
+
+        print("\nTesting tooltips...")
+        test_tooltips_for_truncated_text()
+
+        print()
+        print("=" * 60)
+        print("All tree view tests passed! ✓")
+        print("=" * 60)
+    except Exception as e:
+        print(f"\nTest failed: {e}")
+        import traceback
+        traceback.print_exc()
+        exit(1)
@@ -230,6 +230,30 @@ class MarkdownRenderer:
     </style>
     """
     
+    # Markdown patterns, compiled once instead of on every rendered message
+    _CODE_BLOCK_RE = re.compile(r'```(\w*)\n?(.*?)```', re.DOTALL)
+    _INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+    _BLOCKQUOTE_RE = re.compile(r'^> (.+)$', re.MULTILINE)
+    _HEADER_RULES = (
+        (re.compile(r'^#### (.+)$', re.MULTILINE), r'<h4>\1</h4>'),
+        (re.compile(r'^### (.+)$', re.MULTILINE), r'<h3>\1</h3>'),
+        (re.compile(r'^## (.+)$', re.MULTILINE), r'<h2>\1</h2>'),
+        (re.compile(r'^# (.+)$', re.MULTILINE), r'<h1>\1</h1>'),
+    )
+    _EMPHASIS_RULES = (
+        (re.compile(r'\*\*\*(.+?)\*\*\*'), r'<strong><em>\1</em></strong>'),
+        (re.compile(r'\*\*(.+?)\*\*'), r'<strong>\1</strong>'),
+        (re.compile(r'\*(.+?)\*'), r'<em>\1</em>'),
+        (re.compile(r'__(.+?)__'), r'<strong>\1</strong>'),
+        (re.compile(r'_(.+?)_'), r'<em>\1</em>'),
+    )
+    _LIST_ITEM_RE = re.compile(r'^[\s]*[•\-\*] (.+)$', re.MULTILINE)
+    _LIST_RE = re.compile(r'((?:<li>.*?</li>\n?)+)')
+    _NUMBERED_ITEM_RE = re.compile(r'^[\s]*(\d+)\. (.+)$', re.MULTILINE)
+    _NUMBERED_LIST_RE = re.compile(r'((?:<oli>.*?</oli>\n?)+)')
+    _BR_BEFORE_BLOCK_RE = re.compile(r'<br>\n*(</?(?:ul|ol|li|h[1-4]|blockquote|div|p)>)')
+    _BR_AFTER_BLOCK_RE = re.compile(r'(</(?:ul|ol|h[1-4]|blockquote|div|p)>)\n*<br>')
+    
     @classmethod
     def render(cls, text, is_user=False):
         """Render markdown text to HTML."""
@@ -255,7 +279,7 @@ class MarkdownRenderer:
             return f'%%CODEBLOCK_{index}%%'
         
         # Match fenced code blocks with optional language
-        text = re.sub(r'```(\w*)\n?(.*?)```', save_code_block, text, flags=re.DOTALL)
+        text = cls._CODE_BLOCK_RE.sub(save_code_block, text)
         
         # Extract and protect inline code before HTML escaping
         inline_codes = []
@@ -266,10 +290,10 @@ class MarkdownRenderer:
             inline_codes.append(code)
             return f'%%INLINECODE_{index}%%'
         
-        text = re.sub(r'`([^`]+)`', save_inline_code, text)
+        text = cls._INLINE_CODE_RE.sub(save_inline_code, text)
         
         # Process blockquotes BEFORE HTML escaping (while > is still >)
-        text = re.sub(r'^> (.+)$', r'%%BLOCKQUOTE_START%%\1%%BLOCKQUOTE_END%%', text, flags=re.MULTILINE)
+        text = cls._BLOCKQUOTE_RE.sub(r'%%BLOCKQUOTE_START%%\1%%BLOCKQUOTE_END%%', text)
         
         # Escape HTML in remaining text
         text = html.escape(text)
@@ -284,29 +308,24 @@ class MarkdownRenderer:
             text = text.replace(f'%%INLINECODE_{i}%%', f'<span class="inline-code">{escaped_code}</span>')
         
         # Process headers
-        text = re.sub(r'^#### (.+)$', r'<h4>\1</h4>', text, flags=re.MULTILINE)
-        text = re.sub(r'^### (.+)$', r'<h3>\1</h3>', text, flags=re.MULTILINE)
-        text = re.sub(r'^## (.+)$', r'<h2>\1</h2>', text, flags=re.MULTILINE)
-        text = re.sub(r'^# (.+)$', r'<h1>\1</h1>', text, flags=re.MULTILINE)
+        for pattern, replacement in cls._HEADER_RULES:
+            text = pattern.sub(replacement, text)
         
         # Process bold and italic
-        text = re.sub(r'\*\*\*(.+?)\*\*\*', r'<strong><em>\1</em></strong>', text)
-        text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-        text = re.sub(r'\*(.+?)\*', r'<em>\1</em>', text)
-        text = re.sub(r'__(.+?)__', r'<strong>\1</strong>', text)
-        text = re.sub(r'_(.+?)_', r'<em>\1</em>', text)
+        for pattern, replacement in cls._EMPHASIS_RULES:
+            text = pattern.sub(replacement, text)
         
         # Process unordered lists (• and - and *)
-        text = re.sub(r'^[\s]*[•\-\*] (.+)$', r'<li>\1</li>', text, flags=re.MULTILINE)
+        text = cls._LIST_ITEM_RE.sub(r'<li>\1</li>', text)
         
         # Wrap consecutive <li> items in <ul>
-        text = re.sub(r'((?:<li>.*?</li>\n?)+)', r'<ul>\1</ul>', text)
+        text = cls._LIST_RE.sub(r'<ul>\1</ul>', text)
         
         # Process numbered lists - wrap in <ol>
         # First mark numbered list items
-        text = re.sub(r'^[\s]*(\d+)\. (.+)$', r'<oli>\2</oli>', text, flags=re.MULTILINE)
+        text = cls._NUMBERED_ITEM_RE.sub(r'<oli>\2</oli>', text)
         # Wrap consecutive numbered items in <ol>
-        text = re.sub(r'((?:<oli>.*?</oli>\n?)+)', r'<ol>\1</ol>', text)
+        text = cls._NUMBERED_LIST_RE.sub(r'<ol>\1</ol>', text)
         # Convert <oli> to <li>
         text = text.replace('<oli>', '<li>').replace('</oli>', '</li>')
         
@@ -314,8 +333,8 @@ class MarkdownRenderer:
         text = text.replace('\n', '<br>\n')
         
         # Clean up excessive <br> tags around block elements
-        text = re.sub(r'<br>\n*(</?(?:ul|ol|li|h[1-4]|blockquote|div|p)>)', r'\1', text)
-        text = re.sub(r'(</(?:ul|ol|h[1-4]|blockquote|div|p)>)\n*<br>', r'\1', text)
+        text = cls._BR_BEFORE_BLOCK_RE.sub(r'\1', text)
+        text = cls._BR_AFTER_BLOCK_RE.sub(r'\1', text)
         
         # Restore code blocks with proper rendering
         for i, (language, code) in enumerate(code_blocks):
@@ -1,5 +1,6 @@
 # xmleditor/cli.py
 import argparse
+import os
 import sys
 from .xml_utils import XMLUtilities
 
@@ -14,15 +15,9 @@ def main():
     args = parser.parse_args()
 
     if args.command == "validate":
-        try:
-            with open(args.file, "r", encoding="utf-8") as f:
-                xml_content = f.read()
-        except FileNotFoundError:
+        if not os.path.isfile(args.file):
             print(f"Error: File not found at {args.file}", file=sys.stderr)
             sys.exit(1)
-        except IOError as e:
-            print(f"Error reading file {args.file}: {e}", file=sys.stderr)
-            sys.exit(1)
 
         schema_content = None
         if args.schema:
@@ -36,10 +31,18 @@ def main():
                 print(f"Error reading schema file {args.schema}: {e}", file=sys.stderr)
                 sys.exit(1)
 
-        if schema_content:
-            is_valid, message = XMLUtilities.validate_with_xsd(xml_content, schema_content)
-        else:
-            is_valid, message = XMLUtilities.validate_xml(xml_content)
+        try:
+            if schema_content:
+                # Stream the file through the validator instead of loading it
+                with open(args.file, "rb") as f:
+                    is_valid, message = XMLUtilities.validate_file_with_xsd(f, schema_content)
+            else:
+                with open(args.file, "r", encoding="utf-8") as f:
+                    xml_content = f.read()
+                is_valid, message = XMLUtilities.validate_xml(xml_content)
+        except IOError as e:
+            print(f"Error reading file {args.file}: {e}", file=sys.stderr)
+            sys.exit(1)
 
         if is_valid:
             print("XML is valid.")
@@ -3,6 +3,7 @@ Main window for the XML Editor application.
 """
 
 import os
+import re
 import html
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                               QSplitter, QMenuBar, QMenu, QToolBar, QFileDialog, 
@@ -10,7 +11,7 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                               QLabel, QStatusBar, QTabWidget, QPushButton, QTabBar,
                               QComboBox, QCheckBox, QFrame, QTextBrowser)
 from PyQt6.QtGui import QAction, QKeySequence, QIcon, QActionGroup
-from PyQt6.QtCore import Qt, QSettings, QTimer
+from PyQt6.QtCore import Qt, QSettings, QTimer, QSaveFile, QIODevice
 from PyQt6.Qsci import QsciScintilla
 from xmleditor.xml_editor import XMLEditor
 from xmleditor.xml_tree_view import XMLTreeView
@@ -24,6 +25,41 @@ from xmleditor.theme_manager import ThemeManager, ThemeType
 from xmleditor.ai_assistant import AIAssistantPanel
 
 
+# Markup that identifies a transformation result as HTML
+# (an unprefixed tag name followed by whitespace, '>' or '/>', so namespaced or
+# hyphenated XML names such as <p:section> or <a-b> do not count)
+_HTML_MARKUP_RE = re.compile(
+    r'<(?:!doctype\s+html|(?:html|head|body|p|div|span|table|h[1-6]|ul|ol|li|a|br|pre)(?=[\s/>]))',
+    re.IGNORECASE
+)
+
+
+def _looks_like_html(text: str) -> bool:
+    """Check the start of a transformation result for HTML markup."""
+    return _HTML_MARKUP_RE.search(text, 0, 512) is not None
+
+
+def _write_text_file(file_path: str, text: str):
+    """
+    Write text to a file as UTF-8 in one write.
+    
+    The content goes to a temporary file that replaces the target only once
+    it is complete, so a failed (auto-)save never leaves a truncated file.
+    Where no temporary file can be created next to the target (e.g. a
+    writable file in a read-only directory), the file is written directly.
+    
+    Raises:
+        OSError: If the file cannot be written
+    """
+    save_file = QSaveFile(file_path)
+    save_file.setDirectWriteFallback(True)
+    if not save_file.open(QIODevice.OpenModeFlag.WriteOnly | QIODevice.OpenModeFlag.Text):
+        raise OSError(save_file.errorString())
+    save_file.write(text.encode('utf-8'))
+    if not save_file.commit():
+        raise OSError(save_file.errorString())
+
+
 class MainWindow(QMainWindow):
     """Main application window."""
     
@@ -717,6 +753,9 @@ class MainWindow(QMainWindow):
         self.XSLT_XML_OUTPUT_TAB = 0
         self.XSLT_HTML_PREVIEW_TAB = 1
         
+        # Larger results are not laid out as HTML, which would block the UI
+        self.XSLT_MAX_HTML_PREVIEW_LENGTH = 256 * 1024
+        
         # Tab 1: XML/Text output with syntax highlighting
         self.xslt_result_editor = XMLEditor(theme_type=self.current_theme)
         self.xslt_result_editor.setReadOnly(True)
@@ -898,9 +937,11 @@ class MainWindow(QMainWindow):
     def create_editor_tab(self, title="Untitled", content="", file_path=None):
         """Create a new editor tab."""
         editor = XMLEditor(theme_type=self.current_theme)
-        editor.textChanged.connect(self.on_text_changed)
+        # Set the initial content before connecting textChanged, so loading it
+        # neither marks the current tab as modified nor schedules a tree refresh
         if content:
             editor.set_text(content)
+        editor.textChanged.connect(self.on_text_changed)
         
         index = self.tab_widget.addTab(editor, title)
         self.tab_widget.setCurrentIndex(index)
@@ -1003,8 +1044,7 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(editor.get_text())
+            _write_text_file(file_path, editor.get_text())
             
             current_index = self.tab_widget.currentIndex()
             self.tab_data[current_index] = {
@@ -1047,8 +1087,7 @@ class MainWindow(QMainWindow):
                 editor = self.tab_widget.widget(index)
                 if editor:
                     try:
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(editor.get_text())
+                        _write_text_file(file_path, editor.get_text())
                         
                         # Mark as not modified after successful save
                         self.tab_data[index]['is_modified'] = False
@@ -1339,7 +1378,16 @@ class MainWindow(QMainWindow):
             # Tab 2: HTML preview
             # Safe: QTextBrowser doesn't support JavaScript, only limited HTML/CSS subset
             # setOpenLinks(False) prevents link activation as additional security measure
-            self.xslt_result_browser.setHtml(result)
+            if len(result) > self.XSLT_MAX_HTML_PREVIEW_LENGTH:
+                self.xslt_result_browser.setPlainText(
+                    f"Result is too large for the HTML preview ({len(result):,} characters).\n"
+                    "See the XML Output tab."
+                )
+            elif _looks_like_html(result):
+                self.xslt_result_browser.setHtml(result)
+            else:
+                # Not HTML: show the markup as is instead of laying out unknown tags
+                self.xslt_result_browser.setPlainText(result)
             # Set default tab to XML output
             self.xslt_result_tabs.setCurrentIndex(self.XSLT_XML_OUTPUT_TAB)
             self.statusBar().showMessage("XSLT transformation completed successfully", 3000)
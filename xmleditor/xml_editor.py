@@ -167,18 +167,15 @@ class XMLEditor(QsciScintilla):
             18: ("blue", None),                     # PHP
         }
         
+        base_color = QColor(theme.get_color("base"))
         for style_num, (fg_key, bg_key) in styles.items():
-            fg_color = QColor(theme.get_color(fg_key))
-            self.lexer.setColor(fg_color, style_num)
-            
-            if bg_key:
-                bg_color = QColor(theme.get_color(bg_key))
-                self.lexer.setPaper(bg_color, style_num)
-            else:
-                self.lexer.setPaper(QColor(theme.get_color("base")), style_num)
-            
-            # Keep the font for all styles
-            self.lexer.setFont(self.font, style_num)
+            self.lexer.setColor(QColor(theme.get_color(fg_key)), style_num)
+            paper = QColor(theme.get_color(bg_key)) if bg_key else base_color
+            self.lexer.setPaper(paper, style_num)
+        
+        # The font is the same for every style, so set it for all styles at
+        # once (style -1) instead of once per style
+        self.lexer.setFont(self.font, -1)
         
     def get_text(self):
         """Get the text content of the editor."""
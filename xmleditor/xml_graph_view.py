@@ -54,6 +54,45 @@ NESTING_BG_COLORS = [
 ]
 
 
+# Brushes and pens shared by all nesting containers of the same color index.
+# Containers of structurally identical subtrees look the same, so they share
+# one implicitly-shared Qt brush/pen instead of allocating their own.
+_NESTING_BRUSHES: Dict[int, QBrush] = {}
+_NESTING_PENS: Dict[int, QPen] = {}
+
+# Label fonts shared by all nodes, keyed by (point size, bold). They are created
+# on first use, once the application (and its font database) exists.
+_NODE_FONTS: Dict[Tuple[int, bool], QFont] = {}
+
+
+def _node_font(point_size: int, bold: bool = False) -> QFont:
+    """Return the shared node label font of the given size."""
+    font = _NODE_FONTS.get((point_size, bold))
+    if font is None:
+        if bold:
+            font = QFont("Arial", point_size, QFont.Weight.Bold)
+        else:
+            font = QFont("Arial", point_size)
+        _NODE_FONTS[point_size, bold] = font
+    return font
+
+
+def _compile_constraint_xpath(xpath: str) -> Optional[etree.XPath]:
+    """Compile a key or keyref selector/field XPath, or return None if it is invalid."""
+    try:
+        return etree.XPath(xpath)
+    except etree.XPathSyntaxError:
+        return None
+
+
+def _select_elements(select: etree.XPath, node: etree._Element) -> List[etree._Element]:
+    """Evaluate a compiled XPath and keep only the elements of its result."""
+    result = select(node)
+    if not isinstance(result, list):
+        return []
+    return [item for item in result if isinstance(item, etree._Element)]
+
+
 class NestingContainer(QGraphicsRectItem):
     """A visual container that groups child nodes to show nesting relationship."""
     
@@ -63,11 +102,12 @@ class NestingContainer(QGraphicsRectItem):
         
         # Set up appearance based on depth
         color_index = depth % len(NESTING_BG_COLORS)
-        bg_color = NESTING_BG_COLORS[color_index]
-        border_color = DEPTH_COLORS[color_index]
+        if color_index not in _NESTING_BRUSHES:
+            _NESTING_BRUSHES[color_index] = QBrush(NESTING_BG_COLORS[color_index])
+            _NESTING_PENS[color_index] = QPen(DEPTH_COLORS[color_index], 1, Qt.PenStyle.DashLine)
         
-        self.setBrush(QBrush(bg_color))
-        self.setPen(QPen(border_color, 1, Qt.PenStyle.DashLine))
+        self.setBrush(_NESTING_BRUSHES[color_index])
+        self.setPen(_NESTING_PENS[color_index])
         self.setZValue(-depth - 1)  # Behind nodes at same depth
 
 
@@ -103,15 +143,13 @@ class XMLNodeItem(QGraphicsRectItem):
         # Add depth indicator
         depth_indicator = QGraphicsTextItem(f"L{depth}", self)
         depth_indicator.setDefaultTextColor(QColor(255, 255, 255, 150))
-        depth_font = QFont("Arial", 7)
-        depth_indicator.setFont(depth_font)
+        depth_indicator.setFont(_node_font(7))
         depth_indicator.setPos(3, 3)
         
         # Add tag name text
         self.tag_text = QGraphicsTextItem(tag, self)
         self.tag_text.setDefaultTextColor(QColor(255, 255, 255))
-        font = QFont("Arial", 10, QFont.Weight.Bold)
-        self.tag_text.setFont(font)
+        self.tag_text.setFont(_node_font(10, bold=True))
         
         # Center the text
         text_rect = self.tag_text.boundingRect()
@@ -125,8 +163,7 @@ class XMLNodeItem(QGraphicsRectItem):
             preview = text[:TEXT_PREVIEW_LENGTH] + "..." if len(text) > TEXT_PREVIEW_LENGTH else text
             self.content_text = QGraphicsTextItem(preview, self)
             self.content_text.setDefaultTextColor(QColor(220, 220, 220))
-            content_font = QFont("Arial", 8)
-            self.content_text.setFont(content_font)
+            self.content_text.setFont(_node_font(8))
             content_rect = self.content_text.boundingRect()
             self.content_text.setPos(
                 (120 - content_rect.width()) / 2,
@@ -139,14 +176,21 @@ class XMLNodeItem(QGraphicsRectItem):
             attr_text = f"[{attr_count} attr{'s' if attr_count > 1 else ''}]"
             self.attr_text = QGraphicsTextItem(attr_text, self)
             self.attr_text.setDefaultTextColor(QColor(200, 200, 100))
-            attr_font = QFont("Arial", 7)
-            self.attr_text.setFont(attr_font)
+            self.attr_text.setFont(_node_font(7))
             attr_rect = self.attr_text.boundingRect()
             self.attr_text.setPos(
                 (120 - attr_rect.width()) / 2,
                 46
             )
         
+        # Extent of the node and its labels (which are centred on the node and
+        # may be wider than it), in item coordinates; used for the scene rect
+        pen_margin = self.pen().widthF() / 2
+        self.label_bounds = self.rect().adjusted(-pen_margin, -pen_margin, pen_margin, pen_margin)
+        for label in self.childItems():
+            self.label_bounds = self.label_bounds.united(
+                QRectF(label.pos(), label.boundingRect().size()))
+        
         # Make item movable and selectable
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
@@ -331,6 +375,7 @@ class XMLGraphScene(QGraphicsScene):
         self.horizontal_spacing = 40
         self.vertical_spacing = 80
         self.nesting_padding = 15  # Padding for nesting containers
+        self._layout_bounds = QRectF()  # Extent of the nodes placed by the layout
         self.schema_content: Optional[str] = None  # Store schema for key analysis
         self.layout_algorithm: str = "tree_vertical"  # Default layout
         self.view_mode: str = "data"  # "data" or "types"
@@ -350,6 +395,7 @@ class XMLGraphScene(QGraphicsScene):
         self.connections = []
         self.key_references = []
         self.nesting_containers = []
+        self._layout_bounds = QRectF()
     
     def load_xml(self, xml_content: str, show_namespaces: bool = False, 
                  schema_content: Optional[str] = None):
@@ -398,13 +444,33 @@ class XMLGraphScene(QGraphicsScene):
                     self._apply_type_key_references(schema_content)
             
             # Adjust scene rect to fit all items
-            self.setSceneRect(self.itemsBoundingRect().adjusted(-50, -50, 50, 50))
+            self.setSceneRect(self._compute_scene_bounds().adjusted(-50, -50, 50, 50))
             
         except Exception as e:
             # Show error message in scene
             error_text = self.addText(f"Error: {str(e)}")
             error_text.setDefaultTextColor(QColor(255, 0, 0))
     
+    def _compute_scene_bounds(self) -> QRectF:
+        """
+        Compute the bounding rectangle of the laid out graph.
+        
+        The extents are collected while the layout places the nodes (see
+        _place_node), so no item's bounding rect has to be aggregated here.
+        """
+        bounds = QRectF(self._layout_bounds)
+        
+        # Nesting containers extend past the nodes by their padding
+        if self.nesting_containers:
+            margin = self.nesting_padding + 1  # Including the container border
+            bounds.adjust(-margin, -margin, margin, margin)
+        
+        # Key reference curves may bend outside the node area
+        for ref_line in self.key_references:
+            bounds = bounds.united(ref_line.sceneBoundingRect())
+        
+        return bounds
+    
     def _analyze_type_structure(self, root: etree._Element) -> Dict[str, Dict]:
         """
         Analyze XML elements to build a type structure tree.
@@ -550,39 +616,39 @@ class XMLGraphScene(QGraphicsScene):
             
             # Build a mapping from XPath to graph nodes
             node_map = self._build_node_map()
+            root_tree = xml_tree.getroottree()
             
             # Apply key highlighting
             for key_name, key_info in keys.items():
                 selector_xpath = key_info['selector']
                 field_xpath = key_info['field']
                 
+                select_key_elements = _compile_constraint_xpath(selector_xpath)
+                if select_key_elements is None:
+                    continue  # Skip keys with an invalid selector
+                # An invalid field only skips marking the field elements
+                select_fields = _compile_constraint_xpath(field_xpath)
+                
                 # Find elements matching the selector
                 try:
-                    key_elements = xml_tree.xpath(selector_xpath)
-                    for elem in key_elements:
-                        # Find the field value
-                        field_values = elem.xpath(field_xpath)
-                        
+                    for elem in _select_elements(select_key_elements, xml_tree):
                         # Find corresponding graph node and mark as key
-                        elem_path = xml_tree.getroottree().getpath(elem)
+                        elem_path = root_tree.getpath(elem)
                         if elem_path in node_map:
                             node_map[elem_path].set_as_key()
                             
                         # Also mark the field element if it's a child element
-                        if field_xpath.startswith('@'):
+                        if select_fields is None or field_xpath.startswith('@'):
                             # It's an attribute, the key is on the element itself
                             pass
                         else:
                             # It's a child element
-                            for field_elem in elem.xpath(field_xpath):
-                                if hasattr(field_elem, 'getroottree'):
-                                    field_path = xml_tree.getroottree().getpath(field_elem)
-                                    if field_path in node_map:
-                                        node_map[field_path].set_as_key()
+                            for field_elem in _select_elements(select_fields, elem):
+                                field_path = root_tree.getpath(field_elem)
+                                if field_path in node_map:
+                                    node_map[field_path].set_as_key()
                 except etree.XPathEvalError:
                     pass  # Skip if XPath evaluation fails
-                except Exception:
-                    pass  # Skip other errors
             
             # Apply keyref highlighting and create reference lines
             for keyref_info in keyrefs:
@@ -594,66 +660,80 @@ class XMLGraphScene(QGraphicsScene):
                 selector_xpath = keyref_info['selector']
                 field_xpath = keyref_info['field']
                 
+                # Compile the expressions once per keyref instead of per element
+                select_keyref_elements = _compile_constraint_xpath(selector_xpath)
+                if select_keyref_elements is None:
+                    continue  # Skip keyrefs with an invalid selector
+                # An invalid field only skips the field elements and reference lines
+                select_fields = _compile_constraint_xpath(field_xpath)
+                select_key_elements = _compile_constraint_xpath(key_info['selector'])
+                select_key_values = _compile_constraint_xpath(key_info['field'])
+                
+                # Key elements and their values, evaluated on first use (there
+                # are none to refer to if the key's expressions are invalid)
+                key_entries = None
+                if select_key_elements is None or select_key_values is None:
+                    key_entries = []
+                
                 try:
                     # Find keyref elements
-                    keyref_elements = xml_tree.xpath(selector_xpath)
-                    
-                    for keyref_elem in keyref_elements:
-                        # Get the field value (the reference value)
-                        field_values = keyref_elem.xpath(field_xpath)
-                        
-                        keyref_elem_path = xml_tree.getroottree().getpath(keyref_elem)
+                    for keyref_elem in _select_elements(select_keyref_elements, xml_tree):
+                        keyref_elem_path = root_tree.getpath(keyref_elem)
                         
                         # Mark the keyref element
                         if keyref_elem_path in node_map:
                             node_map[keyref_elem_path].set_as_keyref()
                         
+                        if select_fields is None:
+                            continue
+                        
                         # Also mark the field element
-                        for field_elem in keyref_elem.xpath(field_xpath):
-                            if hasattr(field_elem, 'getroottree'):
-                                field_path = xml_tree.getroottree().getpath(field_elem)
-                                if field_path in node_map:
-                                    keyref_node = node_map[field_path]
-                                    keyref_node.set_as_keyref()
-                                    
-                                    # Get the reference value (handle None text)
-                                    ref_value = field_elem.text if field_elem.text is not None else ""
-                                    
-                                    # Find the matching key element
-                                    key_selector = key_info['selector']
-                                    key_field = key_info['field']
-                                    
-                                    for key_elem in xml_tree.xpath(key_selector):
-                                        key_values = key_elem.xpath(key_field)
+                        for field_elem in _select_elements(select_fields, keyref_elem):
+                            field_path = root_tree.getpath(field_elem)
+                            if field_path in node_map:
+                                keyref_node = node_map[field_path]
+                                keyref_node.set_as_keyref()
+                                
+                                # Get the reference value (handle None text)
+                                ref_value = field_elem.text if field_elem.text is not None else ""
+                                
+                                # The key values are the same for every reference
+                                if key_entries is None:
+                                    key_entries = []
+                                    for key_elem in _select_elements(select_key_elements, xml_tree):
+                                        key_values = select_key_values(key_elem)
+                                        if not isinstance(key_values, list):
+                                            key_values = [key_values]
+                                        key_texts = []
                                         for kv in key_values:
                                             # Handle both string results and element results
                                             if isinstance(kv, str):
-                                                kv_text = kv
-                                            elif hasattr(kv, 'text') and kv.text is not None:
-                                                kv_text = kv.text
+                                                key_texts.append(kv)
+                                            elif isinstance(kv, etree._Element) and kv.text is not None:
+                                                key_texts.append(kv.text)
                                             else:
-                                                kv_text = str(kv) if kv is not None else ""
-                                            
-                                            if kv_text == ref_value and ref_value:
-                                                key_elem_path = xml_tree.getroottree().getpath(key_elem)
-                                                if key_elem_path in node_map:
-                                                    key_node = node_map[key_elem_path]
-                                                    # Create reference line
-                                                    ref_line = KeyReferenceLine(
-                                                        key_node, keyref_node, 
-                                                        keyref_info['name']
-                                                    )
-                                                    self.addItem(ref_line)
-                                                    self.key_references.append(ref_line)
+                                                key_texts.append(str(kv) if kv is not None else "")
+                                        key_entries.append((key_elem, key_texts))
+                                
+                                # Find the matching key element
+                                for key_elem, key_texts in key_entries:
+                                    for kv_text in key_texts:
+                                        if kv_text == ref_value and ref_value:
+                                            key_elem_path = root_tree.getpath(key_elem)
+                                            if key_elem_path in node_map:
+                                                key_node = node_map[key_elem_path]
+                                                # Create reference line
+                                                ref_line = KeyReferenceLine(
+                                                    key_node, keyref_node, 
+                                                    keyref_info['name']
+                                                )
+                                                self.addItem(ref_line)
+                                                self.key_references.append(ref_line)
                 except etree.XPathEvalError:
                     pass  # Skip if XPath evaluation fails
-                except Exception:
-                    pass  # Skip other XPath-related errors
                     
         except etree.XMLSyntaxError:
             pass  # Schema parsing error - don't break the graph
-        except Exception:
-            pass  # Other schema errors - silently continue
     
     def _build_node_map(self) -> Dict[str, XMLNodeItem]:
         """Build a mapping from XPath to graph nodes."""
@@ -806,6 +886,11 @@ class XMLGraphScene(QGraphicsScene):
         
         return node
     
+    def _place_node(self, node: XMLNodeItem, x: float, y: float):
+        """Position a node and extend the layout bounds by its extent."""
+        node.setPos(x, y)
+        self._layout_bounds = self._layout_bounds.united(node.label_bounds.translated(x, y))
+    
     def _calculate_position(self, offset: int, depth: int) -> tuple:
         """Calculate x, y position based on offset and depth."""
         x = offset * (self.node_width + self.horizontal_spacing)
@@ -820,7 +905,7 @@ class XMLGraphScene(QGraphicsScene):
         if not node.child_nodes:
             # Leaf node
             x, y = self._calculate_position(offset, depth)
-            node.setPos(x, y)
+            self._place_node(node, x, y)
             return 1
         
         # Calculate positions for children
@@ -834,7 +919,7 @@ class XMLGraphScene(QGraphicsScene):
         center_x = (first_child_x + last_child_x) / 2
         
         _, y = self._calculate_position(0, depth)
-        node.setPos(center_x, y)
+        self._place_node(node, center_x, y)
         
         return child_width
     
@@ -847,7 +932,7 @@ class XMLGraphScene(QGraphicsScene):
             # Leaf node - swap x and y
             x = depth * (self.node_width + self.horizontal_spacing)
             y = offset * (self.node_height + self.vertical_spacing // 2)
-            node.setPos(x, y)
+            self._place_node(node, x, y)
             return 1
         
         # Calculate positions for children
@@ -861,7 +946,7 @@ class XMLGraphScene(QGraphicsScene):
         center_y = (first_child_y + last_child_y) / 2
         
         x = depth * (self.node_width + self.horizontal_spacing)
-        node.setPos(x, center_y)
+        self._place_node(node, x, center_y)
         
         return child_height
     
@@ -885,7 +970,8 @@ class XMLGraphScene(QGraphicsScene):
         radius_step = 150
         
         # Position root at center
-        root_node.setPos(center_x - self.node_width / 2, center_y - self.node_height / 2)
+        self._place_node(root_node, center_x - self.node_width / 2,
+                         center_y - self.node_height / 2)
         
         def layout_radial_recursive(node: XMLNodeItem, start_angle: float, 
                                     end_angle: float, depth: int):
@@ -908,7 +994,7 @@ class XMLGraphScene(QGraphicsScene):
                 # Calculate position
                 x = center_x + radius * math.cos(child_angle) - self.node_width / 2
                 y = center_y + radius * math.sin(child_angle) - self.node_height / 2
-                child.setPos(x, y)
+                self._place_node(child, x, y)
                 
                 # Recurse for children
                 layout_radial_recursive(child, current_angle, 
@@ -932,7 +1018,7 @@ class XMLGraphScene(QGraphicsScene):
             # Leaf node
             x = offset * (self.node_width + compact_h_spacing)
             y = depth * (self.node_height + compact_v_spacing)
-            node.setPos(x, y)
+            self._place_node(node, x, y)
             return 1
         
         # Calculate positions for children
@@ -946,7 +1032,7 @@ class XMLGraphScene(QGraphicsScene):
         center_x = (first_child_x + last_child_x) / 2
         
         y = depth * (self.node_height + compact_v_spacing)
-        node.setPos(center_x, y)
+        self._place_node(node, center_x, y)
         
         return child_width
     
@@ -7,6 +7,10 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from xmleditor.xml_utils import XMLUtilities
 
 
+# Item data role holding the not-yet-materialized child node dictionaries
+CHILDREN_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
 class XMLTreeView(QTreeWidget):
     """Tree widget for displaying XML structure."""
     
@@ -22,6 +26,9 @@ class XMLTreeView(QTreeWidget):
         
         # Connect selection change signal
         self.itemSelectionChanged.connect(self._on_selection_changed)
+        
+        # Children are created on demand when an item is first expanded
+        self.itemExpanded.connect(self._lazy_expand)
     
     def _on_selection_changed(self):
         """Handle selection change and emit nodeSelected signal with XPath."""
@@ -104,7 +111,11 @@ class XMLTreeView(QTreeWidget):
             tree_structure = XMLUtilities.get_xml_tree_structure(xml_content, show_namespaces)
             
             for node in tree_structure:
-                self.add_node(None, node)
+                root_item = self.add_node(None, node)
+                # Materialize the levels made visible by expandToDepth(1)
+                self._populate_children(root_item)
+                for i in range(root_item.childCount()):
+                    self._populate_children(root_item.child(i))
                 
             self.expandToDepth(1)
         except Exception as e:
@@ -112,13 +123,20 @@ class XMLTreeView(QTreeWidget):
             error_item.setText(0, f"Error: {str(e)}")
             error_item.setForeground(0, Qt.GlobalColor.red)
     
-    def add_node(self, parent_item, node: dict):
+    def add_node(self, parent_item, node: dict) -> QTreeWidgetItem:
         """
-        Recursively add nodes to tree.
+        Add a node to the tree.
+        
+        Children are not created immediately. They are stored on the item
+        together with a placeholder child (so the expand arrow is shown) and
+        materialized by _lazy_expand when the item is first expanded.
         
         Args:
             parent_item: Parent tree widget item
             node: Node dictionary
+            
+        Returns:
+            The created tree widget item
         """
         if parent_item is None:
             item = QTreeWidgetItem(self)
@@ -130,15 +148,43 @@ class XMLTreeView(QTreeWidget):
         
         # Set text content
         if node['text']:
-            item.setText(1, node['text'][:50] + ('...' if len(node['text']) > 50 else ''))
-            item.setToolTip(1, node['text'])
+            if len(node['text']) > 50:
+                item.setText(1, node['text'][:50] + '...')
+                item.setToolTip(1, node['text'])
+            else:
+                item.setText(1, node['text'])
         
         # Set attributes
         if node['attributes']:
             attr_text = ', '.join([f"{k}={v}" for k, v in node['attributes'].items()])
-            item.setText(2, attr_text[:50] + ('...' if len(attr_text) > 50 else ''))
-            item.setToolTip(2, attr_text)
+            if len(attr_text) > 50:
+                item.setText(2, attr_text[:50] + '...')
+                item.setToolTip(2, attr_text)
+            else:
+                item.setText(2, attr_text)
         
-        # Add children
-        for child in node['children']:
+        # Defer children until the item is expanded
+        if node['children']:
+            item.setData(0, CHILDREN_ROLE, node['children'])
+            QTreeWidgetItem(item)
+        
+        return item
+    
+    def _populate_children(self, item: QTreeWidgetItem):
+        """
+        Replace the placeholder of an item with its real children.
+        
+        Args:
+            item: Tree widget item whose children have not been created yet
+        """
+        children = item.data(0, CHILDREN_ROLE)
+        if not children:
+            return
+        item.setData(0, CHILDREN_ROLE, None)
+        item.takeChildren()
+        for child in children:
             self.add_node(item, child)
+    
+    def _lazy_expand(self, item: QTreeWidgetItem):
+        """Create the children of an item the first time it is expanded."""
+        self._populate_children(item)
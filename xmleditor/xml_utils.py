@@ -2,189 +2,437 @@
 XML utilities for parsing, validating, and manipulating XML documents.
 """
 
+import io
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from lxml import etree
-import xml.dom.minidom
-from typing import Optional, List, Tuple
+from typing import IO, Optional, List, Tuple, Union
+
+
+# Maximum number of validation errors listed in a validation message
+MAX_VALIDATION_ERRORS = 50
+
+# Lexical spaces of the XSD types inferred for text content
+_XSD_INTEGER_RE = re.compile(r'[+-]?[0-9]+')
+_XSD_DECIMAL_RE = re.compile(r'[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)')
+
+# Qualified names of the XSD elements emitted by schema generation
+_XS_NAMESPACE = 'http://www.w3.org/2001/XMLSchema'
+_XS_SCHEMA = f'{{{_XS_NAMESPACE}}}schema'
+_XS_ELEMENT = f'{{{_XS_NAMESPACE}}}element'
+_XS_COMPLEX_TYPE = f'{{{_XS_NAMESPACE}}}complexType'
+_XS_SEQUENCE = f'{{{_XS_NAMESPACE}}}sequence'
+_XS_SIMPLE_CONTENT = f'{{{_XS_NAMESPACE}}}simpleContent'
+_XS_EXTENSION = f'{{{_XS_NAMESPACE}}}extension'
+_XS_ATTRIBUTE = f'{{{_XS_NAMESPACE}}}attribute'
+
+# XML content accepted by XMLUtilities: text, or encoded bytes-like data
+XMLContent = Union[str, bytes, bytearray, memoryview]
+
+# Parser used for formatting: drops ignorable whitespace so the document can be
+# re-indented from scratch, and keeps CDATA sections as written
+_FORMAT_PARSER = etree.XMLParser(remove_blank_text=True, strip_cdata=False)
+
+# Parser for formatting text: strings are passed to the parser UTF-8 encoded,
+# so the document's own encoding declaration must not be applied to them
+_FORMAT_TEXT_PARSER = etree.XMLParser(remove_blank_text=True, strip_cdata=False,
+                                      encoding='utf-8')
+
+
+def _to_bytes(xml_data: XMLContent) -> Union[bytes, bytearray, memoryview]:
+    """Return XML content in a form the parser accepts, encoding strings as UTF-8."""
+    if isinstance(xml_data, str):
+        return xml_data.encode('utf-8')
+    return xml_data
+
+
+def _is_mutable_buffer(xml_data: XMLContent) -> bool:
+    """Check for buffers that may change after the call and cannot be cache keys."""
+    return isinstance(xml_data, (bytearray, memoryview))
+
+
+@lru_cache(maxsize=1)
+def _parse_content(xml_data: Union[str, bytes]) -> etree._Element:
+    """Parse XML content, reusing the tree when the same content is parsed again."""
+    return etree.fromstring(_to_bytes(xml_data))
+
+
+def _parse_cached(xml_data: XMLContent) -> etree._Element:
+    """
+    Parse XML content, reusing the tree when the same content is parsed again.
+    
+    The editor typically runs several operations (validation, tree view, XPath,
+    schema generation) on the same buffer, so the tree of the most recently
+    parsed content is kept. Only one tree is kept, since every edit produces
+    new content and older trees of a large document would pile up. Mutable
+    buffers are parsed in place without caching.
+    
+    The cached tree is shared, so it is only used internally by read-only
+    operations and never handed to callers: XPath results are serialized,
+    and parse_xml parses a private tree that the caller may modify.
+    """
+    if _is_mutable_buffer(xml_data):
+        return etree.fromstring(xml_data)
+    return _parse_content(xml_data)
+
+
+@lru_cache(maxsize=1)
+def _analyze_content(xml_data: Union[str, bytes]) -> dict:
+    """Analyze the element structure of XML content, see _analyze_cached."""
+    return XMLUtilities._analyze_elements(_parse_content(xml_data))
+
+
+def _analyze_cached(xml_data: XMLContent) -> dict:
+    """
+    Analyze the element structure of XML content, reusing the result when
+    a schema is generated again for the same content (e.g. XSD and then DTD).
+    Callers must treat the returned dictionary as read-only.
+    """
+    if _is_mutable_buffer(xml_data):
+        return XMLUtilities._analyze_elements(_parse_cached(xml_data))
+    return _analyze_content(xml_data)
+
+
+@lru_cache(maxsize=256)
+def _compile_xpath(xpath_expr: str) -> etree.XPath:
+    """
+    Compile an XPath expression, reusing the result for repeated expressions.
+    
+    String results are returned as plain strings (smart_strings=False), since
+    callers only need their value and not a reference back to the parent node.
+    """
+    return etree.XPath(xpath_expr, smart_strings=False)
+
+
+@lru_cache(maxsize=16)
+def _compile_xsd(xsd_string: str) -> etree.XMLSchema:
+    """Parse and compile an XSD schema, reusing it for repeated validations."""
+    return etree.XMLSchema(etree.fromstring(xsd_string.encode('utf-8')))
+
+
+@lru_cache(maxsize=16)
+def _compile_dtd(dtd_string: str) -> etree.DTD:
+    """Parse a DTD, reusing it for repeated validations."""
+    # DTD declarations are not an XML document, so they are read as a file
+    return etree.DTD(io.StringIO(dtd_string))
+
+
+@lru_cache(maxsize=32)
+def _compile_xslt(xslt_string: str) -> etree.XSLT:
+    """Parse and compile an XSLT stylesheet, reusing it for repeated transformations."""
+    return etree.XSLT(etree.fromstring(xslt_string.encode('utf-8')))
+
+
+def _format_errors(error_log, max_errors: int) -> str:
+    """Format the errors (not warnings) of a validator's error log, one per line."""
+    errors = error_log.filter_from_errors()
+    lines = [f"Line {error.line}: {error.message}" if error.line else error.message
+             for error in errors[:max_errors]]
+    if len(errors) > max_errors:
+        lines.append(f"... and {len(errors) - max_errors} more")
+    return "\n".join(lines)
+
+
+def _iterparse_discarding(source: Union[str, IO[bytes]],
+                          schema: Optional[etree.XMLSchema] = None):
+    """Parse a file incrementally, discarding each element once it has been parsed."""
+    for _, element in etree.iterparse(source, events=('end',), schema=schema):
+        # Drop the element and the already parsed siblings before it
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+def _syntax_error_message(source: Union[str, IO[bytes]], error: etree.XMLSyntaxError) -> str:
+    """
+    Describe a syntax error raised while stream-validating a file.
+    
+    With a schema attached, libxml2 leaves syntax errors out of the error log,
+    so the file is parsed again without the schema to get the error message.
+    File objects that cannot seek back are described by position only.
+    """
+    line, column = error.position
+    if isinstance(source, str) or source.seekable():
+        if not isinstance(source, str):
+            source.seek(0)
+        etree.clear_error_log()
+        try:
+            _iterparse_discarding(source)
+        except etree.XMLSyntaxError as e:
+            errors = e.error_log.filter_from_errors()
+            if errors:
+                return f"Line {errors[0].line}: {errors[0].message}"
+    return f"Line {line}, column {column}: XML syntax error"
 
 
 class XMLUtilities:
     """Utilities for XML operations."""
     
     @staticmethod
-    def parse_xml(xml_string: str) -> Optional[etree._Element]:
+    def parse_xml(xml_string: XMLContent) -> Optional[etree._Element]:
         """
         Parse XML string and return the element tree.
         
+        The tree is parsed on every call and not shared with the parse cache
+        of the other methods, so callers may modify it.
+        
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             
         Returns:
             Element tree or None if parsing fails
         """
         try:
-            return etree.fromstring(xml_string.encode('utf-8'))
+            return etree.fromstring(_to_bytes(xml_string))
         except Exception as e:
             raise ValueError(f"XML parsing error: {str(e)}")
     
     @staticmethod
-    def validate_xml(xml_string: str) -> Tuple[bool, str]:
+    def validate_xml(xml_string: XMLContent) -> Tuple[bool, str]:
         """
         Validate if string is well-formed XML.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             
         Returns:
             Tuple of (is_valid, error_message)
         """
         try:
-            etree.fromstring(xml_string.encode('utf-8'))
+            _parse_cached(xml_string)
             return True, "XML is well-formed"
         except Exception as e:
             return False, f"XML validation error: {str(e)}"
     
     @staticmethod
-    def validate_with_xsd(xml_string: str, xsd_string: str) -> Tuple[bool, str]:
+    def validate_with_xsd(xml_string: XMLContent, xsd_string: str,
+                          max_errors: int = MAX_VALIDATION_ERRORS) -> Tuple[bool, str]:
         """
         Validate XML against XSD schema.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             xsd_string: XSD schema as string
+            max_errors: Maximum number of errors included in the message
             
         Returns:
             Tuple of (is_valid, error_message)
         """
         try:
-            # Parse XSD
-            xsd_doc = etree.fromstring(xsd_string.encode('utf-8'))
-            schema = etree.XMLSchema(xsd_doc)
+            # Parse XSD (compiled schemas are cached by content)
+            schema = _compile_xsd(xsd_string)
             
             # Parse XML
-            xml_doc = etree.fromstring(xml_string.encode('utf-8'))
+            xml_doc = _parse_cached(xml_string)
             
             # Validate
             if schema.validate(xml_doc):
                 return True, "XML is valid against the schema"
             else:
-                errors = []
-                for error in schema.error_log:
-                    errors.append(f"Line {error.line}: {error.message}")
-                return False, "\n".join(errors)
+                return False, _format_errors(schema.error_log, max_errors)
+        except Exception as e:
+            return False, f"Schema validation error: {str(e)}"
+    
+    @staticmethod
+    def validate_many_with_xsd(xml_strings: List[XMLContent], xsd_string: str,
+                               max_workers: Optional[int] = None,
+                               max_errors: int = MAX_VALIDATION_ERRORS) -> List[Tuple[bool, str]]:
+        """
+        Validate several XML documents against the same XSD schema in parallel.
+        
+        libxml2 releases the GIL while parsing and validating, so the documents
+        are validated on a thread pool. Each worker thread compiles its own copy
+        of the schema, since a schema object must not validate concurrently.
+        
+        Args:
+            xml_strings: XML contents as strings or bytes-like objects
+            xsd_string: XSD schema as string
+            max_workers: Number of worker threads (defaults to the CPU count)
+            max_errors: Maximum number of errors included in each message
+            
+        Returns:
+            List of (is_valid, error_message) tuples, in the order of xml_strings
+        """
+        xsd_bytes = xsd_string.encode('utf-8')
+        try:
+            # Report schema errors once instead of once per document
+            _compile_xsd(xsd_string)
+        except Exception as e:
+            return [(False, f"Schema validation error: {str(e)}")] * len(xml_strings)
+        
+        local = threading.local()
+        
+        def validate(xml_string: XMLContent) -> Tuple[bool, str]:
+            try:
+                schema = getattr(local, 'schema', None)
+                if schema is None:
+                    schema = local.schema = etree.XMLSchema(etree.fromstring(xsd_bytes))
+                
+                xml_doc = etree.fromstring(_to_bytes(xml_string))
+                if schema.validate(xml_doc):
+                    return True, "XML is valid against the schema"
+                else:
+                    return False, _format_errors(schema.error_log, max_errors)
+            except Exception as e:
+                return False, f"Schema validation error: {str(e)}"
+        
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            return list(executor.map(validate, xml_strings))
+    
+    @staticmethod
+    def validate_file_with_xsd(source: Union[str, IO[bytes]], xsd_string: str,
+                               max_errors: int = MAX_VALIDATION_ERRORS) -> Tuple[bool, str]:
+        """
+        Validate an XML file against XSD schema without loading it into memory.
+        
+        The document is validated while it is parsed, and each element is
+        discarded once it has been checked, so memory use does not grow with
+        the file size. libxml2 does not record line numbers for schema errors
+        found while streaming, so those errors are listed without them.
+        
+        Args:
+            source: Path or binary file object of the XML document
+            xsd_string: XSD schema as string
+            max_errors: Maximum number of errors included in the message
+            
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        try:
+            schema = _compile_xsd(xsd_string)
+            
+            # Errors are collected in the thread's global error log, which
+            # still holds the errors of the previous run
+            etree.clear_error_log()
+            _iterparse_discarding(source, schema)
+            return True, "XML is valid against the schema"
+        except etree.XMLSyntaxError as e:
+            if e.error_log.filter_from_errors():
+                return False, _format_errors(e.error_log, max_errors)
+            return False, _syntax_error_message(source, e)
         except Exception as e:
             return False, f"Schema validation error: {str(e)}"
     
     @staticmethod
-    def validate_with_dtd(xml_string: str, dtd_string: str) -> Tuple[bool, str]:
+    def validate_with_dtd(xml_string: XMLContent, dtd_string: str,
+                          max_errors: int = MAX_VALIDATION_ERRORS) -> Tuple[bool, str]:
         """
         Validate XML against DTD.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             dtd_string: DTD as string
+            max_errors: Maximum number of errors included in the message
             
         Returns:
             Tuple of (is_valid, error_message)
         """
         try:
-            # Parse DTD
-            dtd = etree.DTD(etree.fromstring(dtd_string.encode('utf-8')))
+            # Parse DTD (compiled DTDs are cached by content)
+            dtd = _compile_dtd(dtd_string)
             
             # Parse XML
-            xml_doc = etree.fromstring(xml_string.encode('utf-8'))
+            xml_doc = _parse_cached(xml_string)
             
             # Validate
             if dtd.validate(xml_doc):
                 return True, "XML is valid against the DTD"
             else:
-                errors = []
-                for error in dtd.error_log:
-                    errors.append(f"Line {error.line}: {error.message}")
-                return False, "\n".join(errors)
+                return False, _format_errors(dtd.error_log, max_errors)
         except Exception as e:
             return False, f"DTD validation error: {str(e)}"
     
     @staticmethod
-    def format_xml(xml_string: str, indent: str = "  ") -> str:
+    def format_xml(xml_string: XMLContent, indent: str = "  ") -> str:
         """
         Format XML with proper indentation.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             indent: Indentation string
             
         Returns:
             Formatted XML string
         """
         try:
-            # Parse and pretty print
-            dom = xml.dom.minidom.parseString(xml_string)
-            pretty_xml = dom.toprettyxml(indent=indent, encoding='utf-8')
-            
-            # Remove extra blank lines
-            lines = pretty_xml.decode('utf-8').split('\n')
-            non_empty_lines = [line for line in lines if line.strip()]
-            return '\n'.join(non_empty_lines)
+            # Parse a private copy, since indenting modifies the tree
+            parser = _FORMAT_TEXT_PARSER if isinstance(xml_string, str) else _FORMAT_PARSER
+            tree = etree.fromstring(_to_bytes(xml_string), parser).getroottree()
+            etree.indent(tree, space=indent)
+            pretty_xml = etree.tostring(tree, encoding='unicode', pretty_print=True)
+            return '<?xml version="1.0" encoding="utf-8"?>\n' + pretty_xml.rstrip('\n')
         except Exception as e:
             raise ValueError(f"XML formatting error: {str(e)}")
     
     @staticmethod
-    def xpath_query(xml_string: str, xpath_expr: str, context_xpath: str = "") -> List[str]:
+    def xpath_query(xml_string: XMLContent, xpath_expr: str, context_xpath: str = "",
+                    return_bytes: bool = False) -> List[Union[str, bytes]]:
         """
         Execute XPath query on XML.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             xpath_expr: XPath expression
             context_xpath: Optional XPath to select the context node (defaults to document root)
+            return_bytes: Return UTF-8 encoded bytes instead of strings, which
+                skips decoding serialized elements for callers that write them out
             
         Returns:
-            List of matching results as strings
+            List of matching results as strings (or bytes if return_bytes is set)
         """
         try:
-            tree = etree.fromstring(xml_string.encode('utf-8'))
+            tree = _parse_cached(xml_string)
             
             # Determine the context node
             if context_xpath:
-                context_nodes = tree.xpath(context_xpath)
+                context_nodes = _compile_xpath(context_xpath)(tree)
                 if not context_nodes:
                     raise ValueError(f"Context node not found: {context_xpath}")
                 # Check if result is an element (can execute xpath on it)
-                if not hasattr(context_nodes[0], 'xpath'):
+                if not isinstance(context_nodes[0], etree._Element):
                     raise ValueError(f"Context XPath must select an element: {context_xpath}")
                 context_node = context_nodes[0]
             else:
                 context_node = tree
             
-            results = context_node.xpath(xpath_expr)
+            results = _compile_xpath(xpath_expr)(context_node)
             
             # Handle non-iterable XPath results (float, bool, string)
             # XPath functions like count(), sum(), boolean(), string(), etc.
             # return scalar values instead of node sets
             if isinstance(results, (float, bool)):
-                return [str(results)]
-            if isinstance(results, str):
-                return [results] if results else []
-            
-            # Handle iterable results (node sets)
-            output = []
-            for result in results:
-                if isinstance(result, etree._Element):
-                    output.append(etree.tostring(result, encoding='unicode', pretty_print=True))
-                else:
-                    output.append(str(result))
+                output = [str(results)]
+            elif isinstance(results, str):
+                output = [results] if results else []
+            else:
+                # Handle iterable results (node sets)
+                encoding = 'utf-8' if return_bytes else 'unicode'
+                output = []
+                for result in results:
+                    if isinstance(result, etree._Element):
+                        output.append(etree.tostring(result, encoding=encoding, pretty_print=True))
+                    else:
+                        output.append(str(result))
+            
+            if return_bytes:
+                output = [item if isinstance(item, bytes) else item.encode('utf-8') for item in output]
             
             return output
         except Exception as e:
             raise ValueError(f"XPath query error: {str(e)}")
     
     @staticmethod
-    def get_xpath_for_element(xml_string: str, line: int, column: int) -> str:
+    def get_xpath_for_element(xml_string: XMLContent, line: int, column: int) -> str:
         """
         Get XPath expression for element at given position.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             line: Line number (1-based)
             column: Column number (1-based)
             
@@ -192,7 +440,7 @@ class XMLUtilities:
             XPath expression
         """
         try:
-            tree = etree.fromstring(xml_string.encode('utf-8'))
+            tree = _parse_cached(xml_string)
             # This is a simplified implementation
             # In a real application, you'd need more sophisticated position tracking
             return tree.getroottree().getpath(tree)
@@ -200,24 +448,30 @@ class XMLUtilities:
             return ""
     
     @staticmethod
-    def apply_xslt(xml_string: str, xslt_string: str) -> str:
+    def apply_xslt(xml_string: XMLContent, xslt_string: str, cached: bool = True) -> str:
         """
         Apply XSLT transformation to XML.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             xslt_string: XSLT stylesheet as string
+            cached: Reuse the cached document tree and compiled stylesheet.
+                Pass False when transforming in a worker thread, so the
+                thread does not share lxml objects with the GUI thread.
             
         Returns:
             Transformed XML string
         """
         try:
-            # Parse XML and XSLT
-            xml_doc = etree.fromstring(xml_string.encode('utf-8'))
-            xslt_doc = etree.fromstring(xslt_string.encode('utf-8'))
-            
-            # Create transformer
-            transform = etree.XSLT(xslt_doc)
+            if cached:
+                # Parse XML
+                xml_doc = _parse_cached(xml_string)
+                
+                # Create transformer (compiled stylesheets are cached by content)
+                transform = _compile_xslt(xslt_string)
+            else:
+                xml_doc = etree.fromstring(_to_bytes(xml_string))
+                transform = etree.XSLT(etree.fromstring(xslt_string.encode('utf-8')))
             
             # Apply transformation
             result = transform(xml_doc)
@@ -227,82 +481,96 @@ class XMLUtilities:
             raise ValueError(f"XSLT transformation error: {str(e)}")
     
     @staticmethod
-    def get_xml_tree_structure(xml_string: str, show_namespaces: bool = False) -> List[dict]:
+    def get_xml_tree_structure(xml_string: XMLContent, show_namespaces: bool = False) -> List[dict]:
         """
         Get XML tree structure for tree view.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             show_namespaces: Whether to show namespace prefixes in tag names
             
         Returns:
             List of dictionaries representing tree nodes
         """
         try:
-            tree = etree.fromstring(xml_string.encode('utf-8'))
+            tree = _parse_cached(xml_string)
+            
+            # Local names already split off namespaced tags, so each distinct
+            # tag is only split once per document
+            local_names = {}
             
             def element_to_dict(element):
                 # Extract tag name, handling namespaces
                 tag = element.tag
-                if isinstance(tag, str):
-                    # Handle namespace - extract local name or prefix
-                    if tag.startswith('{'):
-                        # Tag has namespace URI like {http://...}localname
-                        ns_uri, local_name = tag[1:].split('}', 1)
-                        if show_namespaces:
-                            # Find the prefix for this namespace
-                            prefix = None
-                            for p, uri in element.nsmap.items():
-                                if uri == ns_uri:
-                                    prefix = p
-                                    break
-                            # Use prefix:localname or just localname if no prefix
-                            tag = f"{prefix}:{local_name}" if prefix else local_name
-                        else:
-                            # Just use local name without namespace
-                            tag = local_name
-                    # else: tag has no namespace, use as-is
+                # Handle namespace - extract local name or prefix
+                if not show_namespaces and tag in local_names:
+                    tag = local_names[tag]
+                elif tag.startswith('{'):
+                    # Tag has namespace URI like {http://...}localname
+                    local_name = tag.partition('}')[2]
+                    if show_namespaces:
+                        # Prefix the element was written with (None for the
+                        # default namespace), resolved by libxml2 without
+                        # scanning the element's nsmap
+                        prefix = element.prefix
+                        # Use prefix:localname or just localname if no prefix
+                        tag = f"{prefix}:{local_name}" if prefix else local_name
+                    else:
+                        # Just use local name without namespace
+                        local_names[tag] = local_name
+                        tag = local_name
+                # else: tag has no namespace, use as-is
                 
-                node = {
-                    'tag': tag,
-                    'text': element.text.strip() if element.text and element.text.strip() else '',
+                # Read .text once, each access builds a new string from libxml2
+                text = element.text
+                return {
+                    'tag': sys.intern(tag),
+                    'text': text.strip() if text else '',
                     'attributes': dict(element.attrib),
                     'children': []
                 }
-                for child in element:
-                    node['children'].append(element_to_dict(child))
-                return node
             
-            return [element_to_dict(tree)]
+            # Build the nodes with an explicit stack instead of recursion, so
+            # deeply nested documents cannot hit the recursion limit. Comments
+            # and processing instructions are not shown in the tree.
+            root_node = element_to_dict(tree)
+            stack = [(tree, root_node['children'])]
+            while stack:
+                element, children = stack.pop()
+                for child in element.iterchildren(etree.Element):
+                    child_node = element_to_dict(child)
+                    children.append(child_node)
+                    stack.append((child, child_node['children']))
+            
+            return [root_node]
         except Exception as e:
             raise ValueError(f"Error getting XML structure: {str(e)}")
     
     @staticmethod
-    def generate_xsd_schema(xml_string: str) -> str:
+    def generate_xsd_schema(xml_string: XMLContent) -> str:
         """
         Generate XSD schema from XML document.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             
         Returns:
             Generated XSD schema as string
         """
         try:
-            tree = etree.fromstring(xml_string.encode('utf-8'))
+            tree = _parse_cached(xml_string)
             
-            # Analyze the XML structure
-            element_info = XMLUtilities._analyze_elements(tree)
+            # Analyze the XML structure (cached per document content)
+            element_info = _analyze_cached(xml_string)
             
             # Build XSD schema
             schema_root = etree.Element(
-                '{http://www.w3.org/2001/XMLSchema}schema',
-                nsmap={'xs': 'http://www.w3.org/2001/XMLSchema'}
+                _XS_SCHEMA,
+                nsmap={'xs': _XS_NAMESPACE}
             )
             
             # Generate element definitions for all elements
-            generated = set()
-            XMLUtilities._generate_xsd_element_recursive(schema_root, tree.tag, element_info, generated)
+            XMLUtilities._generate_xsd_elements(schema_root, tree.tag, element_info)
             
             # Pretty print the schema
             return etree.tostring(schema_root, encoding='unicode', pretty_print=True)
@@ -310,33 +578,62 @@ class XMLUtilities:
             raise ValueError(f"XSD schema generation error: {str(e)}")
     
     @staticmethod
-    def _generate_xsd_element_recursive(parent, element_name: str, all_element_info: dict, generated: set):
+    def _generate_xsd_elements(parent, root_name: str, all_element_info: dict):
         """
-        Recursively generate XSD element definitions.
+        Generate XSD element definitions for an element and its descendants.
+        
+        Definitions are emitted depth-first in order of first appearance, using
+        an explicit work stack instead of recursion.
         
         Args:
             parent: Parent XSD element
-            element_name: Name of the element
+            root_name: Name of the root element
             all_element_info: All element information
-            generated: Set of already generated element names
         """
-        if element_name in generated:
-            return
-        generated.add(element_name)
+        # Elements with children or attributes get a definition of their own
+        needs_definition = {
+            name for name, info in all_element_info.items()
+            if info['children'] or info['attributes']
+        }
         
-        element_info = all_element_info[element_name]
-        xs_ns = '{http://www.w3.org/2001/XMLSchema}'
+        generated = set()
+        stack = [root_name]
+        while stack:
+            element_name = stack.pop()
+            if element_name in generated:
+                continue
+            generated.add(element_name)
+            
+            XMLUtilities._generate_xsd_element(parent, element_name, all_element_info)
+            
+            # Queue child elements that need separate definitions, reversed so
+            # they are generated in document order
+            element_info = all_element_info[element_name]
+            for child_name in reversed(element_info['children_order']):
+                if child_name in needs_definition and child_name not in generated:
+                    stack.append(child_name)
+    
+    @staticmethod
+    def _generate_xsd_element(parent, element_name: str, all_element_info: dict):
+        """
+        Generate the XSD definition of a single element.
         
-        element = etree.SubElement(parent, f'{xs_ns}element')
+        Args:
+            parent: Parent XSD element
+            element_name: Name of the element
+            all_element_info: All element information
+        """
+        element_info = all_element_info[element_name]
+        element = etree.SubElement(parent, _XS_ELEMENT)
         element.set('name', element_name)
         
         # Create complex or simple type
         if element_info['children'] or element_info['attributes']:
-            complex_type = etree.SubElement(element, f'{xs_ns}complexType')
+            complex_type = etree.SubElement(element, _XS_COMPLEX_TYPE)
             
             # Handle children
             if element_info['children']:
-                sequence = etree.SubElement(complex_type, f'{xs_ns}sequence')
+                sequence = etree.SubElement(complex_type, _XS_SEQUENCE)
                 
                 # Use the order of first appearance instead of sorted order
                 for child_name in element_info['children_order']:
@@ -346,11 +643,11 @@ class XMLUtilities:
                     # Check if child has its own children or attributes
                     if child_info['children'] or child_info['attributes']:
                         # Reference will be generated separately
-                        child_elem = etree.SubElement(sequence, f'{xs_ns}element')
+                        child_elem = etree.SubElement(sequence, _XS_ELEMENT)
                         child_elem.set('ref', child_name)
                     else:
                         # Inline simple type
-                        child_elem = etree.SubElement(sequence, f'{xs_ns}element')
+                        child_elem = etree.SubElement(sequence, _XS_ELEMENT)
                         child_elem.set('name', child_name)
                         if child_info['text_content']:
                             data_type = XMLUtilities._infer_xsd_type(child_info['text_content'])
@@ -366,14 +663,14 @@ class XMLUtilities:
             
             # Handle text content with attributes
             elif element_info['text_content']:
-                simple_content = etree.SubElement(complex_type, f'{xs_ns}simpleContent')
-                extension = etree.SubElement(simple_content, f'{xs_ns}extension')
+                simple_content = etree.SubElement(complex_type, _XS_SIMPLE_CONTENT)
+                extension = etree.SubElement(simple_content, _XS_EXTENSION)
                 data_type = XMLUtilities._infer_xsd_type(element_info['text_content'])
                 extension.set('base', data_type)
                 
                 # Add attributes to extension
-                for attr_name, attr_info in sorted(element_info['attributes'].items()):
-                    attr_elem = etree.SubElement(extension, f'{xs_ns}attribute')
+                for attr_name, attr_info in element_info['attributes'].items():
+                    attr_elem = etree.SubElement(extension, _XS_ATTRIBUTE)
                     attr_elem.set('name', attr_name)
                     attr_elem.set('type', 'xs:string')
                     if attr_info['required']:
@@ -381,8 +678,8 @@ class XMLUtilities:
             
             # Handle attributes (when no text content)
             if element_info['attributes'] and not element_info['text_content']:
-                for attr_name, attr_info in sorted(element_info['attributes'].items()):
-                    attr_elem = etree.SubElement(complex_type, f'{xs_ns}attribute')
+                for attr_name, attr_info in element_info['attributes'].items():
+                    attr_elem = etree.SubElement(complex_type, _XS_ATTRIBUTE)
                     attr_elem.set('name', attr_name)
                     attr_elem.set('type', 'xs:string')
                     if attr_info['required']:
@@ -394,36 +691,30 @@ class XMLUtilities:
                 element.set('type', data_type)
             else:
                 element.set('type', 'xs:string')
-        
-        # Recursively generate child elements that need separate definitions
-        for child_name in element_info['children']:
-            child_info = all_element_info[child_name]
-            if (child_info['children'] or child_info['attributes']) and child_name not in generated:
-                XMLUtilities._generate_xsd_element_recursive(parent, child_name, all_element_info, generated)
     
     @staticmethod
-    def generate_dtd_schema(xml_string: str) -> str:
+    def generate_dtd_schema(xml_string: XMLContent) -> str:
         """
         Generate DTD schema from XML document.
         
         Args:
-            xml_string: XML content as string
+            xml_string: XML content as string or bytes-like object
             
         Returns:
             Generated DTD schema as string
         """
         try:
-            tree = etree.fromstring(xml_string.encode('utf-8'))
+            tree = _parse_cached(xml_string)
             
-            # Analyze the XML structure
-            element_info = XMLUtilities._analyze_elements(tree)
+            # Analyze the XML structure (cached per document content)
+            element_info = _analyze_cached(xml_string)
             
             # Build DTD schema
             dtd_lines = []
             
             # Generate DTD element declarations
             for element_name, info in sorted(element_info.items()):
-                dtd_lines.append(XMLUtilities._generate_dtd_element(element_name, info))
+                XMLUtilities._generate_dtd_element(dtd_lines, element_name, info)
             
             return '\n'.join(dtd_lines)
         except Exception as e:
@@ -442,12 +733,20 @@ class XMLUtilities:
         """
         element_info = {}
         
-        def analyze_element(element, parent_tag=None):
+        # Number of instances of each tag, and for each (tag, child_tag) pair the
+        # number of those instances containing the child; used to find optional children
+        instance_counts = Counter()
+        child_presence = Counter()
+        
+        # Single pre-order walk over the elements (no Python recursion); comments
+        # and processing instructions are filtered out by lxml
+        for element in root.iter(etree.Element):
             tag = element.tag
             
             # Initialize element info if not exists
-            if tag not in element_info:
-                element_info[tag] = {
+            info = element_info.get(tag)
+            if info is None:
+                info = element_info[tag] = {
                     'children': {},
                     'children_order': [],  # Track order of first appearance
                     'attributes': {},
@@ -455,50 +754,49 @@ class XMLUtilities:
                     'parent_tags': set(),
                     'count_by_parent': {}
                 }
-            
-            info = element_info[tag]
+            instance_counts[tag] += 1
             
             # Track parent relationship
-            if parent_tag:
+            parent = element.getparent()
+            if parent is not None:
+                parent_tag = parent.tag
                 info['parent_tags'].add(parent_tag)
                 if parent_tag not in info['count_by_parent']:
                     info['count_by_parent'][parent_tag] = []
             
             # Analyze attributes
+            attributes = info['attributes']
             for attr_name, attr_value in element.attrib.items():
-                if attr_name not in info['attributes']:
-                    info['attributes'][attr_name] = {'values': [], 'required': True}
-                info['attributes'][attr_name]['values'].append(attr_value)
+                if attr_name not in attributes:
+                    attributes[attr_name] = {'values': [], 'required': True}
+                attributes[attr_name]['values'].append(attr_value)
             
             # Track text content
-            if element.text and element.text.strip():
-                info['text_content'].append(element.text.strip())
-            
-            # Analyze children and track their order
-            child_counts = {}
-            for child in element:
-                child_tag = child.tag
-                child_counts[child_tag] = child_counts.get(child_tag, 0) + 1
-                
-                if child_tag not in info['children']:
-                    info['children'][child_tag] = {'min': float('inf'), 'max': 0}
-                    # Track the order of first appearance
+            text = element.text
+            if text:
+                text = text.strip()
+                if text:
+                    info['text_content'].append(text)
+            
+            # Count children (Counter keeps the order of first appearance)
+            children = info['children']
+            for child_tag, count in Counter(child.tag for child in element.iterchildren(etree.Element)).items():
+                child_info = children.get(child_tag)
+                if child_info is None:
+                    children[child_tag] = {'min': count, 'max': count}
                     info['children_order'].append(child_tag)
-                
-                analyze_element(child, tag)
-            
-            # Update child occurrence counts
-            for child_tag, count in child_counts.items():
-                child_info = info['children'][child_tag]
-                child_info['min'] = min(child_info['min'], count)
-                child_info['max'] = max(child_info['max'], count)
-            
-            # Mark missing children as optional (min=0)
-            for child_tag in info['children']:
-                if child_tag not in child_counts:
-                    info['children'][child_tag]['min'] = 0
+                else:
+                    if count < child_info['min']:
+                        child_info['min'] = count
+                    if count > child_info['max']:
+                        child_info['max'] = count
+                child_presence[tag, child_tag] += 1
         
-        analyze_element(root)
+        # Mark children missing from some instances as optional (min=0)
+        for tag, info in element_info.items():
+            for child_tag, child_info in info['children'].items():
+                if child_presence[tag, child_tag] < instance_counts[tag]:
+                    child_info['min'] = 0
         
         # Determine attribute requirements
         for tag, info in element_info.items():
@@ -510,6 +808,9 @@ class XMLUtilities:
                 if instances_count == 0:
                     instances_count = 1  # At least the element itself
                 attr_info['required'] = len(attr_info['values']) >= instances_count
+            
+            # Store attributes sorted by name, the order the generators emit them in
+            info['attributes'] = dict(sorted(info['attributes'].items()))
         
         return element_info
     
@@ -527,42 +828,25 @@ class XMLUtilities:
         if not text_values:
             return 'xs:string'
         
-        # Try to determine if all values are integers
-        all_int = True
-        all_decimal = True
-        
-        for value in text_values:
-            try:
-                int(value)
-            except ValueError:
-                all_int = False
-            
-            try:
-                float(value)
-            except ValueError:
-                all_decimal = False
-        
-        if all_int:
+        # Match the XSD lexical spaces of xs:integer and xs:decimal; every
+        # integer is also a decimal, so decimals are only checked on failure
+        if all(_XSD_INTEGER_RE.fullmatch(value) for value in text_values):
             return 'xs:integer'
-        elif all_decimal:
+        elif all(_XSD_DECIMAL_RE.fullmatch(value) for value in text_values):
             return 'xs:decimal'
         else:
             return 'xs:string'
     
     @staticmethod
-    def _generate_dtd_element(element_name: str, element_info: dict) -> str:
+    def _generate_dtd_element(lines: List[str], element_name: str, element_info: dict):
         """
         Generate DTD element declaration.
         
         Args:
+            lines: List of DTD lines the declarations are appended to
             element_name: Name of the element
             element_info: Element information dictionary
-            
-        Returns:
-            DTD element declaration string
         """
-        lines = []
-        
         # Generate element declaration
         if element_info['children']:
             # Element has children - use order of first appearance
@@ -589,8 +873,6 @@ class XMLUtilities:
         
         # Generate attribute declarations
         if element_info['attributes']:
-            for attr_name, attr_info in sorted(element_info['attributes'].items()):
+            for attr_name, attr_info in element_info['attributes'].items():
                 required = '#REQUIRED' if attr_info['required'] else '#IMPLIED'
                 lines.append(f'<!ATTLIST {element_name} {attr_name} CDATA {required}>')
-        
-        return '\n'.join(lines)
@@ -3,7 +3,7 @@ XPath query dialog for searching XML documents.
 """
 
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                              QLineEdit, QPushButton, QTextEdit, QMessageBox,
+                              QLineEdit, QPushButton, QPlainTextEdit, QMessageBox,
                               QFrame)
 from PyQt6.QtCore import Qt, QSettings
 from PyQt6.QtGui import QFont
@@ -88,7 +88,7 @@ class XPathDialog(QDialog):
         
         # Results display
         layout.addWidget(QLabel("Results:"))
-        self.results_display = QTextEdit()
+        self.results_display = QPlainTextEdit()
         self.results_display.setReadOnly(True)
         layout.addWidget(self.results_display)
         
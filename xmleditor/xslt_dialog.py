@@ -2,12 +2,43 @@
 XSLT transformation dialog.
 """
 
-from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                              QTextEdit, QPushButton, QFileDialog, QMessageBox)
+from PyQt6.QtWidgets import (QApplication, QDialog, QVBoxLayout, QHBoxLayout,
+                              QLabel, QTextEdit, QPlainTextEdit, QPushButton,
+                              QFileDialog, QMessageBox)
+from PyQt6.QtCore import QThread, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QFont
 from xmleditor.xml_utils import XMLUtilities
 
 
+class XSLTWorkerThread(QThread):
+    """Worker thread for running an XSLT transformation without blocking the UI."""
+    
+    result_ready = pyqtSignal(str)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, xml_content, xslt_content):
+        super().__init__()
+        self.xml_content = xml_content
+        self.xslt_content = xslt_content
+    
+    def run(self):
+        """Execute the transformation."""
+        try:
+            # Use a private tree and stylesheet, since the thread may still be
+            # running after the dialog has closed
+            result = XMLUtilities.apply_xslt(self.xml_content, self.xslt_content,
+                                             cached=False)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
+        else:
+            self.result_ready.emit(result)
+    
+    @pyqtSlot()
+    def wait_until_finished(self):
+        """Block until the transformation has finished."""
+        self.wait()
+
+
 class XSLTDialog(QDialog):
     """Dialog for applying XSLT transformations."""
     
@@ -15,6 +46,7 @@ class XSLTDialog(QDialog):
         super().__init__(parent)
         self.xml_content = xml_content
         self.transformed_xml = ""
+        self.worker_thread = None
         self.init_ui()
         
     def init_ui(self):
@@ -41,13 +73,13 @@ class XSLTDialog(QDialog):
         layout.addWidget(self.xslt_input, 2)
         
         # Transform button
-        transform_btn = QPushButton("Transform")
-        transform_btn.clicked.connect(self.apply_transformation)
-        layout.addWidget(transform_btn)
+        self.transform_btn = QPushButton("Transform")
+        self.transform_btn.clicked.connect(self.apply_transformation)
+        layout.addWidget(self.transform_btn)
         
         # Result display
         layout.addWidget(QLabel("Transformation Result:"))
-        self.result_display = QTextEdit()
+        self.result_display = QPlainTextEdit()
         self.result_display.setReadOnly(True)
         self.result_display.setFont(font)
         layout.addWidget(self.result_display, 3)
@@ -83,16 +115,49 @@ class XSLTDialog(QDialog):
             QMessageBox.warning(self, "Warning", "Please provide an XSLT stylesheet")
             return
         
-        try:
-            self.transformed_xml = XMLUtilities.apply_xslt(self.xml_content, xslt_content)
-            self.result_display.setPlainText(self.transformed_xml)
-            self.save_result_btn.setEnabled(True)
-            self.apply_btn.setEnabled(True)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Transformation failed:\n{str(e)}")
-            self.result_display.setPlainText(f"Error: {str(e)}")
-            self.save_result_btn.setEnabled(False)
-            self.apply_btn.setEnabled(False)
+        # Disable the buttons while the transformation runs
+        self.transform_btn.setEnabled(False)
+        self.save_result_btn.setEnabled(False)
+        self.apply_btn.setEnabled(False)
+        self.result_display.setPlainText("Transforming...")
+        
+        # Run the transformation in a worker thread to keep the UI responsive
+        self.worker_thread = XSLTWorkerThread(self.xml_content, xslt_content)
+        self.worker_thread.result_ready.connect(self.on_transformation_finished)
+        self.worker_thread.error_occurred.connect(self.on_transformation_error)
+        self.worker_thread.start()
+    
+    @pyqtSlot(str)
+    def on_transformation_finished(self, result):
+        """Handle a successful transformation."""
+        self.transformed_xml = result
+        self.result_display.setPlainText(self.transformed_xml)
+        self.transform_btn.setEnabled(True)
+        self.save_result_btn.setEnabled(True)
+        self.apply_btn.setEnabled(True)
+    
+    @pyqtSlot(str)
+    def on_transformation_error(self, error_message):
+        """Handle a failed transformation."""
+        self.transform_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Transformation failed:\n{error_message}")
+        self.result_display.setPlainText(f"Error: {error_message}")
+    
+    def done(self, result):
+        """Close the dialog without waiting for a running transformation."""
+        worker = self.worker_thread
+        if worker is not None and worker.isRunning():
+            # Discard the result, and hand the thread to the application so
+            # it outlives the dialog and is deleted once it has finished
+            worker.result_ready.disconnect(self.on_transformation_finished)
+            worker.error_occurred.disconnect(self.on_transformation_error)
+            app = QApplication.instance()
+            worker.setParent(app)
+            worker.finished.connect(worker.deleteLater)
+            # A running thread must not be destroyed when the application quits
+            app.aboutToQuit.connect(worker.wait_until_finished)
+            self.worker_thread = None
+        super().done(result)
     
     def load_xslt_file(self):
         """Load XSLT stylesheet from file."""